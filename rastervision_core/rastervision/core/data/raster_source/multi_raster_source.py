@@ -1,17 +1,66 @@
-from typing import TYPE_CHECKING, Optional, Sequence, Self, Tuple
+from typing import (TYPE_CHECKING, Literal, Optional, Sequence, Self, Tuple)
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import logging
+import os
+from threading import Lock, local
+
 from pydantic import conint
 
 import numpy as np
-from pystac import Item
 
 from rastervision.core.box import Box
-from rastervision.core.data.raster_source import RasterSource, RasterioSource
-from rastervision.core.data.raster_source.stac_config import subset_assets
-from rastervision.core.data.utils import all_equal
+from rastervision.core.data.raster_source import RasterSource
+from rastervision.core.data.utils import aligned_empty, all_equal
+from rastervision.pipeline import rv_config_ as rv_config
 
 if TYPE_CHECKING:
+    import numpy.typing as npt
+    from pystac import Item
     from rastervision.core.data import RasterTransformer, CRSTransformer
 
+log = logging.getLogger(__name__)
+
+DEFAULT_READ_CONCURRENCY = 8
+MAP_COORDS_CACHE_SIZE = 1024
+
+_thread_pools: dict[tuple[int, int], ThreadPoolExecutor] = {}
+_thread_pools_lock = Lock()
+# marks the threads of the pools above
+_pool_thread = local()
+
+
+def _init_pool_thread() -> None:
+    _pool_thread.is_worker = True
+
+
+def _in_pool_thread() -> bool:
+    """Whether the current thread is a worker of a shared thread pool."""
+    return getattr(_pool_thread, 'is_worker', False)
+
+
+def _get_thread_pool(max_workers: int) -> ThreadPoolExecutor:
+    """Get a shared thread pool for reading from sub raster sources.
+
+    Pools are created lazily and keyed by process ID so that a pool created
+    in a parent process is never reused in a forked child (e.g. a DataLoader
+    worker), where its threads would no longer exist.
+
+    Tasks running in these pools must not submit to them and wait on the
+    results, since that can deadlock once all workers are waiting. Use
+    :func:`._in_pool_thread` to check for this.
+    """
+    key = (os.getpid(), max_workers)
+    with _thread_pools_lock:
+        pool = _thread_pools.get(key)
+        if pool is None:
+            pool = ThreadPoolExecutor(
+                max_workers=max_workers,
+                thread_name_prefix='MultiRasterSource',
+                initializer=_init_pool_thread)
+            _thread_pools[key] = pool
+    return pool
+
 
 class MultiRasterSource(RasterSource):
     """Merge multiple ``RasterSources`` by concatenating along channel dim."""
@@ -22,7 +71,9 @@ class MultiRasterSource(RasterSource):
                  force_same_dtype: bool = False,
                  channel_order: Optional[Sequence[conint(ge=0)]] = None,
                  raster_transformers: Sequence = [],
-                 bbox: Optional[Box] = None):
+                 bbox: Optional[Box] = None,
+                 read_concurrency: Optional[conint(ge=1)] = None,
+                 output_dtype: Optional['npt.DTypeLike'] = None):
         """Constructor.
 
         Args:
@@ -41,11 +92,31 @@ class MultiRasterSource(RasterSource):
                 If given, the primary raster source's bbox is set to this.
                 If None, the full extent available in the source file of the
                 primary raster source is used.
+            read_concurrency (Optional[conint(ge=1)]): Maximum number of
+                threads to use for reading from the non-primary sub raster
+                sources concurrently. If 1, sub raster sources are read one
+                after the other. If None, the value of the
+                ``RASTERVISION_MULTI_RASTER_SOURCE_READ_CONCURRENCY`` option
+                is used, which itself defaults to 8. Defaults to None.
+            output_dtype (Optional[npt.DTypeLike]): If given, the chips
+                returned by :meth:`.get_chip` are cast to this dtype, e.g.
+                ``np.float16`` for models that run in half precision.
+                ``'bfloat16'`` is also supported if ``ml_dtypes`` is
+                installed. Without ``raster_transformers``, the cast happens
+                while the chip is assembled from the sub-chips; otherwise,
+                after the transformers have been applied, so that they see
+                the original dtype. Raw chips (see :meth:`.get_raw_chip`)
+                are not cast. If None, chips are not cast. Defaults to None.
         """
-        num_channels_raw = sum(rs.num_channels for rs in raster_sources)
+        # num_channels can be expensive to compute for some RasterSources
+        # (e.g. RasterioSource reads a test chip), so only query it once.
+        # Sub-chip i occupies channels [offsets[i], offsets[i + 1]) of the
+        # concatenated raw chip.
+        rs_num_channels = [rs.num_channels for rs in raster_sources]
+        channel_offsets = np.cumsum([0] + rs_num_channels)
+        num_channels_raw = int(channel_offsets[-1])
         if not channel_order:
-            num_channels = sum(rs.num_channels for rs in raster_sources)
-            channel_order = list(range(num_channels))
+            channel_order = list(range(num_channels_raw))
 
         # validate primary_source_idx
         if not (0 <= primary_source_idx < len(raster_sources)):
@@ -70,13 +141,24 @@ class MultiRasterSource(RasterSource):
             rs for i, rs in enumerate(raster_sources)
             if i != primary_source_idx
         ]
+        self._channel_offsets = channel_offsets
+        # per sub-chip (src, dst) channel indices for writing sub-chips into
+        # the output chip with and without channel_order applied
+        self._concat_plan = [(slice(None), slice(start, end))
+                             for start, end in zip(self._channel_offsets[:-1],
+                                                   self._channel_offsets[1:])]
+        self._init_sub_chip_readers()
+        self._init_read_concurrency(read_concurrency)
+        self._init_map_coords_cache()
+        self.output_dtype = _parse_dtype(output_dtype)
+        self._init_gather_plan()
 
         self.validate_raster_sources()
 
     @classmethod
     def from_stac(
             cls,
-            item: Item,
+            item: 'Item',
             assets: list[str] | None,
             primary_source_idx: conint(ge=0) = 0,
             raster_transformers: list['RasterTransformer'] = [],
@@ -84,7 +166,8 @@ class MultiRasterSource(RasterSource):
             channel_order: Sequence[int] | None = None,
             bbox: Box | tuple[int, int, int, int] | None = None,
             bbox_map_coords: Box | tuple[int, int, int, int] | None = None,
-            allow_streaming: bool = False) -> Self:
+            allow_streaming: bool = False,
+            read_concurrency: int | None = None) -> Self:
         """Construct a ``MultiRasterSource`` from a STAC Item.
 
         This creates a :class:`.RasterioSource` for each asset and puts all
@@ -120,7 +203,16 @@ class MultiRasterSource(RasterSource):
                 Defaults to ``None``.
             allow_streaming: Passed to :class:`.RasterioSource`. If ``False``,
                 assets will be downloaded. Defaults to ``True``.
+            read_concurrency: Maximum number of threads to use for reading
+                from the assets concurrently. See :meth:`.__init__`.
+                Defaults to ``None``.
         """
+        # only used here; note that the raster_source package imports these
+        # modules anyway, so this does not save any import time
+        from rastervision.core.data.raster_source import RasterioSource
+        from rastervision.core.data.raster_source.stac_config import (
+            subset_assets)
+
         if bbox is not None and bbox_map_coords is not None:
             raise ValueError('Specify either bbox or bbox_map_coords, '
                              'but not both.')
@@ -147,9 +239,76 @@ class MultiRasterSource(RasterSource):
             raster_transformers=raster_transformers,
             channel_order=channel_order,
             force_same_dtype=force_same_dtype,
-            bbox=bbox)
+            bbox=bbox,
+            read_concurrency=read_concurrency)
         return raster_source
 
+    def _init_sub_chip_readers(self) -> None:
+        """Bind the sub raster sources' chip-reading methods once.
+
+        The i-th element of ``_px_readers`` (``_map_readers``) reads a chip
+        from the i-th sub raster source using a pixel-coords (map-coords)
+        window.
+        """
+        self._px_readers = [rs.get_chip for rs in self.raster_sources]
+        self._map_readers = [
+            rs.get_chip_by_map_window for rs in self.raster_sources
+        ]
+
+    def _init_read_concurrency(self,
+                               read_concurrency: Optional[int] = None) -> None:
+        """Decide whether non-primary sub raster sources are read in threads.
+
+        Reads are only done concurrently if there are at least 2 non-primary
+        sub raster sources and none of them appears more than once, since the
+        same file handle must not be read from multiple threads at once.
+        """
+        if read_concurrency is None:
+            read_concurrency = int(
+                rv_config.get_namespace_option(
+                    'rastervision',
+                    'MULTI_RASTER_SOURCE_READ_CONCURRENCY',
+                    default=DEFAULT_READ_CONCURRENCY))
+        self.read_concurrency = read_concurrency
+        num_sources = len(self.raster_sources)
+        all_distinct = len(set(map(id, self.raster_sources))) == num_sources
+        self._read_concurrently = (read_concurrency > 1 and num_sources > 2
+                                   and all_distinct)
+
+    def _init_map_coords_cache(self) -> None:
+        """Set up an LRU cache for primary pixel window -> map conversions.
+
+        The same windows tend to be read repeatedly (e.g. once per epoch), so
+        this avoids redoing the CRS transformation each time.
+        """
+        self._pixel_to_map_cached = lru_cache(maxsize=MAP_COORDS_CACHE_SIZE)(
+            self._pixel_to_map)
+
+    def __getstate__(self) -> dict:
+        # the cache wraps a bound method and cannot be pickled (e.g. when
+        # sending the raster source to DataLoader worker processes)
+        state = self.__dict__.copy()
+        del state['_pixel_to_map_cached']
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._init_map_coords_cache()
+
+    def _pixel_to_map(self, window: Tuple[int, int, int, int],
+                      bbox: Tuple[int, int, int, int]) -> Box:
+        crs_transformer = self.primary_source.crs_transformer
+        return crs_transformer.pixel_to_map(Box(*window), bbox=Box(*bbox))
+
+    def _get_window_map_coords(self, window: Box) -> Box:
+        """Convert a pixel-coords window to map coords via the primary CRS.
+
+        Results are cached. Since ``Box`` is mutable, the cache is keyed on
+        the window's and the primary source's bbox's coordinates.
+        """
+        return self._pixel_to_map_cached(
+            window.tuple_format(), self.primary_source.bbox.tuple_format())
+
     def validate_raster_sources(self) -> None:
         """Validate sub-``RasterSources``.
 
@@ -157,20 +316,86 @@ class MultiRasterSource(RasterSource):
 
         - dtypes are same or ``force_same_dtype`` is True.
 
+        Also checks whether all sub-``RasterSources`` are on the same pixel
+        grid i.e. have the same CRS transform and bbox as the primary source.
+        If so, chips are read from them without converting the window to map
+        coords and back.
+        """
+        if not self.force_same_dtype:
+            dtypes = [rs.dtype for rs in self.raster_sources]
+            if not all_equal(dtypes):
+                raise ValueError(
+                    'dtypes of all sub raster sources must be the same. '
+                    f'Got: {dtypes} '
+                    '(Use force_same_dtype to cast all to the dtype of the '
+                    'primary source)')
+
+        primary_rs = self.primary_source
+        self._uniform_grid = all(
+            rs.bbox == primary_rs.bbox and _same_pixel_grid(
+                rs.crs_transformer, primary_rs.crs_transformer)
+            for rs in self.raster_sources)
+
+    def _init_gather_plan(self) -> None:
+        """(Re)compute the values that depend on ``channel_order``."""
+        self._gather_plan = self._make_gather_plan()
+        # sub raster sources none of whose channels are in channel_order don't
+        # need to be read by get_chip(); the primary one is always read since
+        # it determines the shape of the chip
+        source_idxs = np.searchsorted(
+            self._channel_offsets, self._channel_order_arr, side='right') - 1
+        self._used_source_idxs = sorted(
+            set(source_idxs.tolist()) | {self.primary_source_idx})
+        # a single sub raster source whose chips are used as-is can be read
+        # from directly, without copying its chips
+        self._single = (len(self.raster_sources) == 1
+                        and self._channel_order_is_identity
+                        and self.output_dtype is None)
+
+    def _make_gather_plan(self) -> list[tuple[np.ndarray | slice, ...]]:
+        """Map each sub-chip's channels to their position in the output.
+
+        For the i-th sub raster source, computes the indices of its channels
+        that survive ``channel_order`` (src) and the indices in the final chip
+        that they are written to (dst). If both are contiguous runs, they are
+        stored as slices so that no copies are made when reading from the
+        sub-chip. Otherwise, they are stored as integer arrays.
+
+        Returns:
+            list[tuple[np.ndarray | slice, ...]]: A (src, dst) pair for each
+            sub raster source.
         """
-        dtypes = [rs.dtype for rs in self.raster_sources]
-        if not self.force_same_dtype and not all_equal(dtypes):
-            raise ValueError(
-                'dtypes of all sub raster sources must be the same. '
-                f'Got: {dtypes} '
-                '(Use force_same_dtype to cast all to the dtype of the '
-                'primary source)')
+        channel_order = self._channel_order_arr
+        gather_plan = []
+        for start, end in zip(self._channel_offsets[:-1],
+                              self._channel_offsets[1:]):
+            dst_idxs = np.flatnonzero((channel_order >= start)
+                                      & (channel_order < end))
+            src_idxs = channel_order[dst_idxs] - start
+            src_slice = _contiguous_slice(src_idxs)
+            dst_slice = _contiguous_slice(dst_idxs)
+            if src_slice is not None and dst_slice is not None:
+                gather_plan.append((src_slice, dst_slice))
+            else:
+                gather_plan.append((src_idxs, dst_idxs.astype(np.intp)))
+        return gather_plan
+
+    @RasterSource.channel_order.setter
+    def channel_order(self, channel_order: Sequence[int]) -> None:
+        RasterSource.channel_order.fset(self, channel_order)
+        # channel_order can be changed after __init__ (e.g. by the Predictor)
+        if hasattr(self, '_channel_offsets'):
+            self._init_gather_plan()
 
     @property
     def primary_source(self) -> RasterSource:
         """Primary sub-``RasterSource``"""
         return self.raster_sources[self.primary_source_idx]
 
+    def set_bbox(self, bbox: Box) -> None:
+        super().set_bbox(bbox)
+        self._pixel_to_map_cached.cache_clear()
+
     @property
     def shape(self) -> Tuple[int, ...]:
         """Shape of the raster as a (..., H, W, C) tuple."""
@@ -179,25 +404,32 @@ class MultiRasterSource(RasterSource):
 
     @property
     def dtype(self) -> np.dtype:
+        if self.output_dtype is not None:
+            return self.output_dtype
         return self.primary_source.dtype
 
     @property
     def crs_transformer(self) -> 'CRSTransformer':
         return self.primary_source.crs_transformer
 
-    def _get_sub_chips(self,
-                       window: Box,
-                       out_shape: Optional[Tuple[int, int]] = None
-                       ) -> list[np.ndarray]:
+    def _get_sub_chips(
+            self,
+            window: Box,
+            out_shape: Optional[Tuple[int, int]] = None,
+            source_idxs: Optional[Sequence[int]] = None) -> list[np.ndarray]:
         """Return chips from sub raster sources as a list.
 
-        If all extents are identical, simply retrieves chips from each sub
-        raster source. Otherwise, follows the following algorithm
+        If all sub raster sources have the same CRS transform and bbox (see
+        :meth:`.validate_raster_sources`), simply retrieves chips from each
+        sub raster source using the pixel-coords window. Otherwise, follows
+        the following algorithm
             - using pixel-coords window, get chip from the primary sub raster
             source
             - convert window to world coords using the CRS of the primary sub
             raster source
-            - for each remaining sub raster source
+            - for each remaining sub raster source (concurrently, using a
+            thread pool, if there are enough of them; see
+            ``read_concurrency`` in :meth:`.__init__`)
                 - convert world-coords window to pixel coords using the sub
                 raster source's CRS
                 - get chip from the sub raster source using this window;
@@ -209,41 +441,63 @@ class MultiRasterSource(RasterSource):
                 coordinates.
             out_shape (Optional[Tuple[int, int]]): (height, width) to resize
                 the chip to.
+            source_idxs (Optional[Sequence[int]]): Indices of the sub raster
+                sources to read from. Must include ``primary_source_idx``.
+                The sub-chips of the other sources are None. If None, all sub
+                raster sources are read. Defaults to None.
 
         Returns:
             List[np.ndarray]: List of chips from each sub raster source.
+            These are not cast to the same dtype even if
+            ``force_same_dtype=True``; that is left to the caller so that the
+            cast can happen while writing to the output array.
         """
+        sub_chips_batch = self._get_sub_chips_batch(
+            [window], out_shape=out_shape, source_idxs=source_idxs)
+        return sub_chips_batch[0]
 
-        def get_chip(
-                rs: RasterSource,
-                window: Box,
-                map: bool = False,
-                out_shape: Optional[Tuple[int, int]] = None) -> np.ndarray:
-            if map:
-                func = rs.get_chip_by_map_window
-            else:
-                func = rs.get_chip
-            return func(window, out_shape=out_shape)
+    def _get_sub_chips_batch(self,
+                             windows: Sequence[Box],
+                             out_shape: Optional[Tuple[int, int]] = None,
+                             source_idxs: Optional[Sequence[int]] = None
+                             ) -> list[list[np.ndarray]]:
+        """Like :meth:`._get_sub_chips`, but for multiple windows at once.
 
-        primary_rs = self.primary_source
-        other_rses = self.non_primary_sources
-
-        primary_sub_chip = get_chip(primary_rs, window, out_shape=out_shape)
-        if out_shape is None:
-            out_shape = primary_sub_chip.shape[:2]
-        window_map_coords = primary_rs.crs_transformer.pixel_to_map(
-            window, bbox=primary_rs.bbox)
-        sub_chips = [
-            get_chip(rs, window_map_coords, map=True, out_shape=out_shape)
-            for rs in other_rses
-        ]
-        sub_chips.insert(self.primary_source_idx, primary_sub_chip)
-
-        if self.force_same_dtype:
-            dtype = sub_chips[self.primary_source_idx].dtype
-            sub_chips = [chip.astype(dtype) for chip in sub_chips]
+        Args:
+            windows (Sequence[Box]): Windows in pixel coordinates.
+            out_shape (Optional[Tuple[int, int]]): (height, width) to resize
+                the chips to.
+            source_idxs (Optional[Sequence[int]]): Indices of the sub raster
+                sources to read from. See :meth:`._get_sub_chips`.
 
-        return sub_chips
+        Returns:
+            list[list[np.ndarray]]: Sub-chips for each window.
+        """
+        if source_idxs is None:
+            source_idxs = range(len(self.raster_sources))
+        sub_chips_batch = [[None] * len(self.raster_sources) for _ in windows]
+        out_shapes = [out_shape] * len(windows)
+        if self._uniform_grid:
+            self._read_sub_chips(sub_chips_batch, windows, out_shapes,
+                                 source_idxs)
+            return sub_chips_batch
+
+        read_primary = self._px_readers[self.primary_source_idx]
+        for b, window in enumerate(windows):
+            primary_sub_chip = read_primary(window, out_shape=out_shape)
+            sub_chips_batch[b][self.primary_source_idx] = primary_sub_chip
+            if out_shape is None:
+                out_shapes[b] = primary_sub_chip.shape[:2]
+        if len(source_idxs) == 1:
+            return sub_chips_batch
+        windows_map_coords = [self._get_window_map_coords(w) for w in windows]
+        self._read_sub_chips(
+            sub_chips_batch,
+            windows_map_coords,
+            out_shapes,
+            source_idxs,
+            map=True)
+        return sub_chips_batch
 
     def _get_chip(self,
                   window: Box,
@@ -259,13 +513,126 @@ class MultiRasterSource(RasterSource):
         Returns:
             [height, width, channels] numpy array
         """
+        if self._single:
+            return self.primary_source.get_chip(window, out_shape=out_shape)
         sub_chips = self._get_sub_chips(window, out_shape=out_shape)
-        chip = np.concatenate(sub_chips, axis=-1)
+        chip = self._merge_sub_chips(sub_chips, self._concat_plan,
+                                     self.num_channels_raw)
+        return chip
+
+    def _read_sub_chips(self,
+                        sub_chips_batch: list[list[Optional[np.ndarray]]],
+                        windows: Sequence[Box],
+                        out_shapes: Sequence[Optional[Tuple[int, int]]],
+                        source_idxs: Sequence[int],
+                        map: bool = False) -> None:
+        """Fill in missing sub-chips by reading the windows from their sources.
+
+        For the b-th window, the i-th sub raster source is read if it is in
+        ``source_idxs`` and ``sub_chips_batch[b][i]`` is None. If
+        ``read_concurrency`` allows it, sub raster sources are read
+        concurrently using a thread pool, unless this is already running in
+        one of its threads. Each sub raster source is only ever read by one
+        thread at a time.
+
+        Args:
+            sub_chips_batch (list[list[Optional[np.ndarray]]]): Sub-chips,
+                one per sub raster source, for each window. Modified in place.
+            windows (Sequence[Box]): Windows in pixel coords or, if
+                ``map=True``, in map coords.
+            out_shapes (Sequence[Optional[Tuple[int, int]]]): (height, width)
+                to resize the sub-chips of each window to.
+            source_idxs (Sequence[int]): Indices of the sub raster sources to
+                read from.
+            map (bool): Whether ``windows`` are in map coords.
+                Defaults to False.
+        """
+        readers = self._map_readers if map else self._px_readers
+
+        def read_all(i: int) -> None:
+            read = readers[i]
+            for sub_chips, window, out_shape in zip(sub_chips_batch, windows,
+                                                    out_shapes):
+                if sub_chips[i] is None:
+                    sub_chips[i] = read(window, out_shape=out_shape)
+
+        # nested MultiRasterSources (e.g. a TemporalMultiRasterSource of
+        # MultiRasterSources) are read sequentially inside pool threads
+        if self._read_concurrently and not _in_pool_thread():
+            pool = _get_thread_pool(self.read_concurrency)
+            futures = [pool.submit(read_all, i) for i in source_idxs]
+            for future in futures:
+                future.result()
+        else:
+            for i in source_idxs:
+                read_all(i)
+
+    def _merge_sub_chips(self,
+                         sub_chips: list[np.ndarray],
+                         merge_plan: list[tuple[np.ndarray | slice, ...]],
+                         num_channels: int,
+                         layout: Literal['hwc', 'chw'] = 'hwc',
+                         dtype: Optional[np.dtype] = None,
+                         out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Write sub-chips into a single preallocated output chip.
+
+        Unless ``out`` is given, the output has the dtype of the primary
+        sub-chip, or ``dtype``, if specified. If ``force_same_dtype=True``,
+        other sub-chips are cast to it as they are written; otherwise, all
+        dtypes are already the same (see :meth:`.validate_raster_sources`).
+
+        Args:
+            sub_chips (list[np.ndarray]): Chips from each sub raster source.
+                Sub-chips that are None (i.e. that were not read) are skipped.
+            merge_plan (list[tuple[np.ndarray | slice, ...]]): (src, dst)
+                channel indices for each sub-chip. See
+                :meth:`._make_gather_plan`.
+            num_channels (int): Number of channels in the output chip.
+            layout (Literal['hwc', 'chw']): Memory layout of the output chip.
+                If 'chw', the chip is allocated as (..., channels, height,
+                width) but still returned as a (..., height, width, channels)
+                view of it. Defaults to 'hwc'.
+            dtype (Optional[np.dtype]): dtype of the output chip, if ``out``
+                is not given. Defaults to None.
+            out (Optional[np.ndarray]): Array to write the sub-chips into
+                instead of allocating a new one. Must have the shape implied
+                by ``layout``. Defaults to None.
+
+        Returns:
+            np.ndarray: Array of shape (..., height, width, num_channels).
+        """
+        primary_sub_chip = sub_chips[self.primary_source_idx]
+        *shape, h, w, _ = primary_sub_chip.shape
+        if layout == 'hwc':
+            chip_shape = (*shape, h, w, num_channels)
+        elif layout == 'chw':
+            chip_shape = (*shape, num_channels, h, w)
+        else:
+            raise ValueError(f'Unknown layout: {layout}.')
+
+        if out is None:
+            if dtype is None:
+                dtype = primary_sub_chip.dtype
+            chip = aligned_empty(chip_shape, dtype=dtype)
+        elif out.shape != chip_shape:
+            raise ValueError(f'Expected out to have shape {chip_shape}, '
+                             f'but got {out.shape}.')
+        else:
+            chip = out
+
+        if layout == 'chw':
+            chip = np.moveaxis(chip, -3, -1)
+        for sub_chip, (src, dst) in zip(sub_chips, merge_plan):
+            if sub_chip is None:
+                continue
+            chip[..., dst] = sub_chip[..., src]
         return chip
 
     def get_chip(self,
                  window: Box,
-                 out_shape: Optional[Tuple[int, int]] = None) -> np.ndarray:
+                 out_shape: Optional[Tuple[int, int]] = None,
+                 layout: Literal['hwc', 'chw'] = 'hwc',
+                 out: Optional[np.ndarray] = None) -> np.ndarray:
         """Return the transformed chip in the window.
 
         Get processed chips from sub raster sources (with their respective
@@ -277,15 +644,169 @@ class MultiRasterSource(RasterSource):
                 coordinates.
             out_shape (Optional[Tuple[int, int]]): (height, width) to resize
                 the chip to.
+            layout (Literal['hwc', 'chw']): If 'chw', return a planar
+                [channels, height, width] chip, so that per-channel operations
+                on it work on contiguous memory. Transformers still see a
+                [height, width, channels] view of the same memory.
+                Defaults to 'hwc'.
+            out (Optional[np.ndarray]): A preallocated array to write the
+                chip into, e.g. a buffer that is reused across calls to avoid
+                allocating a new chip each time. Must have the same shape as
+                the returned chip would. The chip is cast to the dtype of
+                ``out`` if they differ. If given, ``out`` is returned.
+                Defaults to None.
 
         Returns:
-            np.ndarray with shape [height, width, channels]
+            np.ndarray with shape [height, width, channels] or
+            [channels, height, width], depending on ``layout``.
         """
-        sub_chips = self._get_sub_chips(window, out_shape=out_shape)
-        chip = np.concatenate(sub_chips, axis=-1)
-        chip = chip[..., self.channel_order]
+        if self._single and layout == 'hwc' and out is None:
+            chip = self.primary_source.get_chip(window, out_shape=out_shape)
+            # chip may be a view of the sub raster source's data, so it must
+            # not be transformed in place
+            for transformer in self.raster_transformers:
+                chip = transformer.transform(chip, self.channel_order)
+            return chip
+
+        sub_chips = self._get_sub_chips(
+            window, out_shape=out_shape, source_idxs=self._used_source_idxs)
+        chip = self._merge_sub_chips(
+            sub_chips,
+            self._gather_plan,
+            self.num_channels,
+            layout=layout,
+            dtype=self._assembly_dtype(),
+            # transformers may change the dtype (e.g. StatsTransformer), so
+            # the raw chip can only be written into out if there are none
+            out=None if self.raster_transformers else out)
+
+        # chip is a freshly allocated array (or out), so transformers can
+        # safely overwrite it
+        buf = chip
+        chip = self._transform_inplace(chip)
+
+        if out is not None:
+            # with transformers, the chip was not assembled in out; also,
+            # transformers (and the output_dtype cast) may return a new array
+            if self.raster_transformers or chip is not buf:
+                if layout == 'chw':
+                    np.moveaxis(out, -3, -1)[:] = chip
+                else:
+                    out[:] = chip
+            return out
+
+        if layout == 'chw':
+            chip = np.moveaxis(chip, -1, -3)
 
-        for transformer in self.raster_transformers:
-            chip = transformer.transform(chip, self.channel_order)
+        return chip
+
+    def get_chips(self,
+                  windows: Sequence[Box],
+                  out_shape: Optional[Tuple[int, int]] = None) -> np.ndarray:
+        """Return the transformed chips for a batch of windows.
+
+        Same as calling :meth:`.get_chip` on each window and stacking the
+        results, but reads for all windows are issued together and the chips
+        are collected into a single array.
+
+        All windows must result in chips of the same shape, e.g. they must
+        all have the same size or ``out_shape`` must be specified.
+
+        Args:
+            windows (Sequence[Box]): The windows for which to get the chips,
+                in pixel coordinates.
+            out_shape (Optional[Tuple[int, int]]): (height, width) to resize
+                the chips to.
 
+        Returns:
+            np.ndarray: Array of shape (batch, ..., height, width, channels).
+        """
+        windows = list(windows)
+        if len(windows) == 0:
+            raise ValueError('windows must not be empty.')
+        sub_chips_batch = self._get_sub_chips_batch(
+            windows, out_shape=out_shape, source_idxs=self._used_source_idxs)
+        chips = None
+        for b, sub_chips in enumerate(sub_chips_batch):
+            if chips is not None and not self.raster_transformers:
+                # without transformers, chips keep the dtype they are
+                # assembled in, so they can be written into chips directly
+                self._assemble_chip(sub_chips, out=chips[b])
+                continue
+            # transformers may change the dtype (e.g. StatsTransformer), so
+            # the raw chip must not be written into chips before they run
+            chip = self._assemble_chip(sub_chips)
+            chip = self._transform_inplace(chip)
+            if chips is None:
+                # the shape and dtype of the transformed chips are only known
+                # once the first one has been read
+                chips = aligned_empty((len(windows), *chip.shape), chip.dtype)
+            chips[b] = chip
+        return chips
+
+    def _assemble_chip(self,
+                       sub_chips: list[np.ndarray],
+                       out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Combine sub-chips into a chip with channel_order applied."""
+        return self._merge_sub_chips(
+            sub_chips,
+            self._gather_plan,
+            self.num_channels,
+            dtype=self._assembly_dtype(),
+            out=out)
+
+    def _assembly_dtype(self) -> Optional[np.dtype]:
+        """dtype to assemble the chips returned by get_chip() in.
+
+        Chips can only be cast to ``output_dtype`` while being assembled if
+        there are no transformers; otherwise, the transformers must see the
+        original dtype.
+        """
+        if self.raster_transformers:
+            return None
+        return self.output_dtype
+
+    def _transform_inplace(self, chip: np.ndarray) -> np.ndarray:
+        """Apply raster_transformers, overwriting chip where possible.
+
+        The result is cast to ``output_dtype``, if specified.
+        """
+        for transformer in self.raster_transformers:
+            chip = transformer.transform_inplace(chip, self.channel_order)
+        if self.output_dtype is not None:
+            chip = chip.astype(self.output_dtype, copy=False)
         return chip
+
+
+def _contiguous_slice(idxs: np.ndarray) -> Optional[slice]:
+    """Convert an index array to an equivalent slice, if possible."""
+    if len(idxs) == 0:
+        return slice(0, 0)
+    start, stop = int(idxs[0]), int(idxs[-1]) + 1
+    if np.array_equal(idxs, np.arange(start, stop)):
+        return slice(start, stop)
+    return None
+
+
+def _parse_dtype(dtype: Optional['npt.DTypeLike']) -> Optional[np.dtype]:
+    """Convert to np.dtype, resolving ``'bfloat16'`` via ``ml_dtypes``."""
+    if dtype is None:
+        return None
+    if isinstance(dtype, str) and dtype == 'bfloat16':
+        try:
+            from ml_dtypes import bfloat16
+        except ModuleNotFoundError:
+            raise ModuleNotFoundError(
+                'ml_dtypes must be installed to use bfloat16 output_dtype.')
+        return np.dtype(bfloat16)
+    return np.dtype(dtype)
+
+
+def _same_pixel_grid(crs_transformer_1: 'CRSTransformer',
+                     crs_transformer_2: 'CRSTransformer') -> bool:
+    """Check if two CRS transformers map pixels to the same locations."""
+    if crs_transformer_1 is crs_transformer_2:
+        return True
+    return (type(crs_transformer_1) is type(crs_transformer_2)
+            and crs_transformer_1.transform == crs_transformer_2.transform
+            and crs_transformer_1.image_crs == crs_transformer_2.image_crs)
@@ -49,11 +49,25 @@ class RasterSource(ABC):
         if any(c >= num_channels_raw for c in channel_order):
             raise ChannelOrderError(channel_order, num_channels_raw)
 
-        self.channel_order = channel_order
         self.num_channels_raw = num_channels_raw
+        self.channel_order = channel_order
         self.raster_transformers = raster_transformers
         self._bbox = bbox
 
+    @property
+    def channel_order(self) -> List[int]:
+        """Indices of the raw channels that make up the output chip."""
+        return self._channel_order
+
+    @channel_order.setter
+    def channel_order(self, channel_order: List[int]) -> None:
+        self._channel_order = channel_order
+        # converting channel_order to an index array on every get_chip() call
+        # is not free, so do it once here
+        self._channel_order_arr = np.asarray(channel_order, dtype=np.intp)
+        self._channel_order_is_identity = np.array_equal(
+            self._channel_order_arr, np.arange(self.num_channels_raw))
+
     @property
     def num_channels(self) -> int:
         """Number of channels in the chips read from this source."""
@@ -140,7 +154,8 @@ class RasterSource(ABC):
             np.ndarray: Array of shape (..., height, width, channels).
         """
         chip = self._get_chip(window, out_shape=out_shape)
-        chip = chip[..., self.channel_order]
+        if not self._channel_order_is_identity:
+            chip = np.take(chip, self._channel_order_arr, axis=-1)
 
         for transformer in self.raster_transformers:
             chip = transformer.transform(chip, self.channel_order)
@@ -1,4 +1,4 @@
-from typing import Any, Optional, Sequence, Tuple
+from typing import TYPE_CHECKING, Any, Optional, Sequence, Tuple
 from pydantic import conint
 
 import numpy as np
@@ -6,7 +6,13 @@ import numpy as np
 from rastervision.core.box import Box
 from rastervision.core.data.raster_source import (RasterSource,
                                                   MultiRasterSource)
-from rastervision.core.data.utils import all_equal, parse_array_slices_Nd
+from rastervision.core.data.raster_source.multi_raster_source import (
+    _parse_dtype)
+from rastervision.core.data.utils import (aligned_empty, all_equal,
+                                          parse_array_slices_Nd)
+
+if TYPE_CHECKING:
+    import numpy.typing as npt
 
 
 class TemporalMultiRasterSource(MultiRasterSource):
@@ -17,7 +23,9 @@ class TemporalMultiRasterSource(MultiRasterSource):
                  primary_source_idx: conint(ge=0) = 0,
                  force_same_dtype: bool = False,
                  raster_transformers: Sequence = [],
-                 bbox: Optional[Box] = None):
+                 bbox: Optional[Box] = None,
+                 read_concurrency: Optional[conint(ge=1)] = None,
+                 output_dtype: Optional['npt.DTypeLike'] = None):
         """Constructor.
 
         Args:
@@ -34,8 +42,15 @@ class TemporalMultiRasterSource(MultiRasterSource):
                 If given, the primary raster source's bbox is set to this.
                 If None, the full extent available in the source file of the
                 primary raster source is used.
+            read_concurrency (Optional[conint(ge=1)]): Maximum number of
+                threads to use for reading from the non-primary sub raster
+                sources concurrently. See :class:`.MultiRasterSource`.
+                Defaults to None.
+            output_dtype (Optional[npt.DTypeLike]): If given, the chips
+                returned by :meth:`.get_chip` are cast to this dtype. See
+                :class:`.MultiRasterSource`. Defaults to None.
         """
-        if not all_equal([rs.num_channels for rs in raster_sources]):
+        if not all_equal(rs.num_channels for rs in raster_sources):
             raise ValueError(
                 'All sub raster sources must have the same num_channels.')
 
@@ -67,6 +82,12 @@ class TemporalMultiRasterSource(MultiRasterSource):
         self.non_primary_sources = [
             rs for rs in self.raster_sources if rs != self.primary_source
         ]
+        self._init_sub_chip_readers()
+        # every time step is part of the chip
+        self._used_source_idxs = list(range(len(raster_sources)))
+        self._init_read_concurrency(read_concurrency)
+        self._init_map_coords_cache()
+        self.output_dtype = _parse_dtype(output_dtype)
 
         self.validate_raster_sources()
 
@@ -92,7 +113,33 @@ class TemporalMultiRasterSource(MultiRasterSource):
             np.ndarray: 4D array of shape (T, H, W, C).
         """
         sub_chips = self._get_sub_chips(window, out_shape=out_shape)
-        chip = np.stack(sub_chips)
+        chip = self._stack_sub_chips(sub_chips)
+        return chip
+
+    def _stack_sub_chips(self,
+                         sub_chips: list[np.ndarray],
+                         dtype: Optional[np.dtype] = None,
+                         out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Stack sub-chips along a new leading temporal dim.
+
+        Sub-chips are written directly into a preallocated output array with
+        the dtype of the primary sub-chip (or ``dtype``, if specified),
+        casting them as needed. If ``out`` is given, it is used as the output
+        array instead.
+        """
+        primary_sub_chip = sub_chips[self.primary_source_idx]
+        chip_shape = (len(sub_chips), *primary_sub_chip.shape)
+        if out is None:
+            if dtype is None:
+                dtype = primary_sub_chip.dtype
+            chip = aligned_empty(chip_shape, dtype)
+        elif out.shape != chip_shape:
+            raise ValueError(f'Expected out to have shape {chip_shape}, '
+                             f'but got {out.shape}.')
+        else:
+            chip = out
+        for i, sub_chip in enumerate(sub_chips):
+            chip[i] = sub_chip
         return chip
 
     def get_chip(self,
@@ -114,13 +161,16 @@ class TemporalMultiRasterSource(MultiRasterSource):
             np.ndarray: 4D array of shape (T, H, W, C).
         """
         sub_chips = self._get_sub_chips(window, out_shape=out_shape)
-        chip = np.stack(sub_chips)
-
-        for transformer in self.raster_transformers:
-            chip = transformer.transform(chip, self.channel_order)
-
+        chip = self._stack_sub_chips(sub_chips, dtype=self._assembly_dtype())
+        chip = self._transform_inplace(chip)
         return chip
 
+    def _assemble_chip(self,
+                       sub_chips: list[np.ndarray],
+                       out: Optional[np.ndarray] = None) -> np.ndarray:
+        return self._stack_sub_chips(
+            sub_chips, dtype=self._assembly_dtype(), out=out)
+
     def __getitem__(self, key: Any) -> 'np.ndarray':
         if isinstance(key, Box):
             return self.get_chip(key)
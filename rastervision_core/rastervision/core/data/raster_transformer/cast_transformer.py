@@ -32,3 +32,16 @@ class CastTransformer(RasterTransformer):
             [height, width, channels] numpy array
         """
         return chip.astype(self.to_dtype)
+
+    def transform_inplace(self,
+                          chip: np.ndarray,
+                          channel_order: Optional[list] = None) -> np.ndarray:
+        """Cast chip to self.to_dtype, without copying if already cast.
+
+        Args:
+            chip: ndarray of shape [height, width, channels]
+
+        Returns:
+            [height, width, channels] numpy array
+        """
+        return chip.astype(self.to_dtype, copy=False)
@@ -18,3 +18,19 @@ class MinMaxTransformer(RasterTransformer):
         chip_normalized = (chip - channel_mins) / (channel_maxs - channel_mins)
         chip_normalized = (255 * chip_normalized).astype(np.uint8)
         return chip_normalized
+
+    def transform_inplace(self,
+                          chip: np.ndarray,
+                          channel_order: Optional[List[int]] = None
+                          ) -> np.ndarray:
+        # integer chips cannot hold the intermediate results
+        if not np.issubdtype(chip.dtype, np.floating):
+            return self.transform(chip, channel_order)
+        c = chip.shape[-1]
+        pixels = chip.reshape(-1, c)
+        channel_mins = pixels.min(axis=0)
+        channel_maxs = pixels.max(axis=0)
+        chip -= channel_mins
+        chip /= (channel_maxs - channel_mins)
+        chip *= 255
+        return chip.astype(np.uint8)
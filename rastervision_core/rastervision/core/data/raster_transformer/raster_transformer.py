@@ -23,3 +23,25 @@ class RasterTransformer(ABC):
         Returns:
             (np.ndarray): Array of shape (..., H, W, C)
         """
+
+    def transform_inplace(self, chip: 'np.ndarray',
+                          channel_order=None) -> 'np.ndarray':
+        """Transform a chip, reusing its memory where possible.
+
+        Unlike :meth:`.transform`, this is allowed to overwrite ``chip``, so
+        callers must only use it on arrays that they own. Transformers that
+        change the dtype may still need to return a new array. The default
+        implementation simply calls :meth:`.transform`.
+
+        Args:
+            chip: ndarray of shape [height, width, channels] This is assumed to already
+                have the channel_order applied to it if channel_order is set. In other
+                words, channels should be equal to len(channel_order).
+            channel_order: list of indices of channels that were extracted from the
+                raw imagery.
+
+        Returns:
+            (np.ndarray): Array of shape (..., H, W, C). May be ``chip``
+            itself.
+        """
+        return self.transform(chip, channel_order)
@@ -60,6 +60,22 @@ class StatsTransformer(RasterTransformer):
             [height, width, channels] uint8 numpy array
 
         """
+        return self._transform(chip, channel_order, inplace=False)
+
+    def transform_inplace(self,
+                          chip: np.ndarray,
+                          channel_order: Optional[Sequence[int]] = None
+                          ) -> np.ndarray:
+        """Transform a chip, overwriting it if it is already float64.
+
+        See :meth:`.transform`.
+        """
+        return self._transform(chip, channel_order, inplace=True)
+
+    def _transform(self,
+                   chip: np.ndarray,
+                   channel_order: Optional[Sequence[int]] = None,
+                   inplace: bool = False) -> np.ndarray:
         if chip.dtype == np.uint8:
             return chip
 
@@ -74,7 +90,7 @@ class StatsTransformer(RasterTransformer):
         nodata_mask = chip == 0
 
         # Subtract mean and divide by std to get zscores.
-        chip = chip.astype(float)
+        chip = chip.astype(float, copy=not inplace)
         chip -= means
         chip /= stds
 
@@ -1,4 +1,5 @@
-from typing import TYPE_CHECKING, Any, List, Optional, Sequence, Tuple, Union
+from typing import (TYPE_CHECKING, Any, Iterable, List, Optional, Sequence,
+                    Tuple, Union)
 import logging
 
 import numpy as np
@@ -8,6 +9,7 @@ from skimage.io import imsave
 from rastervision.core.box import Box
 
 if TYPE_CHECKING:
+    import numpy.typing as npt
     from rastervision.core.data import (RasterSource, LabelSource, LabelStore)
 
 log = logging.getLogger(__name__)
@@ -82,9 +84,36 @@ def rgb_to_int_array(rgb_array: np.ndarray) -> np.ndarray:
     return r + g + b
 
 
-def all_equal(it: list):
+def all_equal(it: Iterable) -> bool:
     ''' Returns true if all elements are equal to each other '''
-    return it.count(it[0]) == len(it)
+    it = iter(it)
+    first = next(it, None)
+    return all(x == first for x in it)
+
+
+def aligned_empty(shape: Union[int, Sequence[int]],
+                  dtype: 'npt.DTypeLike',
+                  align: int = 64) -> np.ndarray:
+    """Like ``np.empty()``, but the array's data is ``align``-byte aligned.
+
+    NumPy only guarantees 16-byte alignment, which is not enough for the
+    aligned loads used by wide (e.g. AVX-512) SIMD instructions.
+
+    Args:
+        shape (Union[int, Sequence[int]]): Shape of the array.
+        dtype (npt.DTypeLike): Data type of the array.
+        align (int): Required alignment of the data, in bytes. Must be a
+            multiple of the itemsize of ``dtype``. Defaults to 64.
+
+    Returns:
+        np.ndarray: Uninitialized, C-contiguous array.
+    """
+    dtype = np.dtype(dtype)
+    shape = (shape, ) if isinstance(shape, int) else tuple(shape)
+    nbytes = int(np.prod(shape)) * dtype.itemsize
+    buf = np.empty(nbytes + align, dtype=np.uint8)
+    offset = -buf.ctypes.data % align
+    return buf[offset:offset + nbytes].view(dtype).reshape(shape)
 
 
 def listify_uris(uris: Union[str, List[str]]) -> List[str]:
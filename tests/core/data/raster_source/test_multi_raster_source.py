@@ -1,5 +1,8 @@
 from typing import Callable
+import pickle
+from threading import Thread
 import unittest
+from unittest.mock import patch
 
 import numpy as np
 from xarray import DataArray
@@ -10,7 +13,7 @@ from rastervision.core.box import Box
 from rastervision.core.data import (
     RasterioSourceConfig, MultiRasterSource, MultiRasterSourceConfig,
     ReclassTransformerConfig, CastTransformerConfig, XarraySource,
-    IdentityCRSTransformer, TemporalMultiRasterSource)
+    IdentityCRSTransformer, TemporalMultiRasterSource, StatsTransformer)
 
 from tests import data_file_path
 
@@ -133,6 +136,16 @@ class TestMultiRasterSource(unittest.TestCase):
                          primary_rs.crs_transformer.transform)
         self.assertNotEqual(rs.crs_transformer, non_primary_rs.crs_transformer)
 
+    def test_force_same_dtype(self):
+        cfg = make_cfg_diverse(
+            diff_dtypes=True, force_same_dtype=True, primary_source_idx=1)
+        rs = cfg.build(tmp_dir=self.tmp_dir)
+        self.assertEqual(rs.dtype, np.float32)
+        for get_chip_fn in [rs._get_chip, rs.get_chip]:
+            chip = get_chip_fn(Box(0, 0, 60, 60))
+            self.assertEqual(chip.dtype, np.float32)
+            self.assertEqual(set(np.unique(chip[..., 1])), {175})
+
     def test_bbox(self):
         # /wo user specified extent
         cfg = make_cfg('small-rgb-tile.tif')
@@ -186,6 +199,85 @@ class TestMultiRasterSource(unittest.TestCase):
         chip = rs.get_chip(window)
         self.assertEqual(tuple(chip.reshape(-1, 3).mean(axis=0)), (25, 17, 10))
 
+    def test_get_chip_out(self):
+        # the transformer returns a new array
+        cfg = make_cfg_diverse(
+            diff_dtypes=False,
+            transformers=[ReclassTransformerConfig(mapping={100: 10})])
+        rs = cfg.build(tmp_dir=self.tmp_dir)
+        window = Box(0, 0, 10, 10)
+        chip_expected = rs.get_chip(window)
+
+        out = np.zeros((10, 10, 3), dtype=np.uint8)
+        chip = rs.get_chip(window, out=out)
+        self.assertIs(chip, out)
+        np.testing.assert_array_equal(out, chip_expected)
+
+        out = np.zeros((3, 10, 10), dtype=np.float32)
+        chip = rs.get_chip(window, layout='chw', out=out)
+        self.assertIs(chip, out)
+        np.testing.assert_array_equal(out, chip_expected.transpose(2, 0, 1))
+
+        out = np.zeros((10, 10, 2), dtype=np.uint8)
+        self.assertRaises(ValueError, lambda: rs.get_chip(window, out=out))
+
+        # the transformer changes the dtype and its output depends on the
+        # input dtype
+        arr = np.random.RandomState(0).randint(
+            0, 2**16, size=(10, 10, 1), dtype=np.uint16)
+        sub_rss = [
+            XarraySource(
+                DataArray(arr, dims=['y', 'x', 'band']),
+                IdentityCRSTransformer()) for _ in range(2)
+        ]
+        tf = StatsTransformer(means=[30000, 30000], stds=[10000, 10000])
+        rs = MultiRasterSource(sub_rss, raster_transformers=[tf])
+        chip_expected = rs.get_chip(window)
+        out = np.zeros((10, 10, 2), dtype=np.uint8)
+        rs.get_chip(window, out=out)
+        np.testing.assert_array_equal(out, chip_expected)
+        out = np.zeros((2, 10, 10), dtype=np.uint8)
+        rs.get_chip(window, layout='chw', out=out)
+        np.testing.assert_array_equal(out, chip_expected.transpose(2, 0, 1))
+
+    def test_get_chips(self):
+        # the transformers change the dtype and return new arrays
+        cfg = make_cfg_diverse(
+            diff_dtypes=False,
+            transformers=[
+                ReclassTransformerConfig(mapping={100: 10}),
+                CastTransformerConfig(to_dtype='float32')
+            ])
+        rs = cfg.build(tmp_dir=self.tmp_dir)
+        windows = [Box(0, 0, 10, 10), Box(5, 5, 15, 15), Box(20, 0, 30, 10)]
+        chips_expected = np.stack([rs.get_chip(w) for w in windows])
+        chips = rs.get_chips(windows)
+        self.assertEqual(chips.dtype, np.float32)
+        np.testing.assert_array_equal(chips, chips_expected)
+
+        windows = [Box(0, 0, 10, 10), Box(0, 0, 20, 20)]
+        chips = rs.get_chips(windows, out_shape=(4, 4))
+        self.assertEqual(chips.shape, (2, 4, 4, 3))
+        self.assertRaises(ValueError, lambda: rs.get_chips(windows))
+        self.assertRaises(ValueError, lambda: rs.get_chips([]))
+
+        # the transformer changes the dtype and its output depends on the
+        # input dtype
+        arr = np.random.RandomState(0).randint(
+            0, 2**16, size=(10, 10, 1), dtype=np.uint16)
+        sub_rss = [
+            XarraySource(
+                DataArray(arr // (i + 1), dims=['y', 'x', 'band']),
+                IdentityCRSTransformer()) for i in range(2)
+        ]
+        tf = StatsTransformer(means=[30000, 15000], stds=[10000, 5000])
+        rs = MultiRasterSource(sub_rss, raster_transformers=[tf])
+        windows = [Box(0, 0, 4, 4), Box(2, 2, 6, 6), Box(6, 6, 10, 10)]
+        chips_expected = np.stack([rs.get_chip(w) for w in windows])
+        chips = rs.get_chips(windows)
+        self.assertEqual(chips.dtype, np.uint8)
+        np.testing.assert_array_equal(chips, chips_expected)
+
     def test_nonidentical_extents_and_resolutions(self):
         cfg = make_cfg_diverse(diff_dtypes=False)
         rs = cfg.build(tmp_dir=self.tmp_dir)
@@ -204,6 +296,163 @@ class TestMultiRasterSource(unittest.TestCase):
             self.assertEqual(set(np.unique(full_img[..., 1])), {0, 175})
             self.assertEqual(set(np.unique(full_img[..., 2])), {0, 250})
 
+    def test_uniform_grid(self):
+        rs = make_cfg('small-rgb-tile.tif').build(tmp_dir=self.tmp_dir)
+        self.assertTrue(rs._uniform_grid)
+        window = Box(10, 10, 60, 60)
+        chip = rs.get_chip(window)
+        rs._uniform_grid = False
+        np.testing.assert_array_equal(rs.get_chip(window), chip)
+
+        rs = make_cfg_diverse().build(tmp_dir=self.tmp_dir)
+        self.assertFalse(rs._uniform_grid)
+
+        # only the primary source's bbox is changed
+        cfg = make_cfg('small-rgb-tile.tif', bbox=(64, 64, 192, 192))
+        rs = cfg.build(tmp_dir=self.tmp_dir)
+        self.assertFalse(rs._uniform_grid)
+
+    def test_single_sub_raster_source(self):
+        arr = np.arange(5 * 5 * 3, dtype=np.uint8).reshape(5, 5, 3)
+        rs = XarraySource(
+            DataArray(arr, dims=['y', 'x', 'band']), IdentityCRSTransformer())
+        tf = ReclassTransformerConfig(mapping={0: 255}).build()
+        window = Box(0, 0, 2, 2)
+
+        mrs = MultiRasterSource([rs], raster_transformers=[tf])
+        self.assertTrue(mrs._single)
+        chip_expected = arr[:2, :2].copy()
+        chip_expected[0, 0, 0] = 255
+        np.testing.assert_array_equal(mrs.get_chip(window), chip_expected)
+        np.testing.assert_array_equal(mrs._get_chip(window), arr[:2, :2])
+
+        mrs = MultiRasterSource([rs], channel_order=[2, 1])
+        self.assertFalse(mrs._single)
+        np.testing.assert_array_equal(
+            mrs.get_chip(window), arr[:2, :2, [2, 1]])
+
+    def test_set_channel_order(self):
+        arr = np.arange(5 * 5 * 3, dtype=np.uint8).reshape(5, 5, 3)
+        rs = XarraySource(
+            DataArray(arr, dims=['y', 'x', 'band']), IdentityCRSTransformer())
+        window = Box(0, 0, 2, 2)
+
+        mrs = MultiRasterSource([rs, rs])
+        mrs.channel_order = [5, 0, 1]
+        self.assertFalse(mrs._single)
+        self.assertEqual(mrs.num_channels, 3)
+        np.testing.assert_array_equal(
+            mrs.get_chip(window), arr[:2, :2, [2, 0, 1]])
+
+    def test_skip_unused_sub_raster_sources(self):
+        arr = np.arange(5 * 5 * 3, dtype=np.uint8).reshape(5, 5, 3)
+        sub_rss = [
+            XarraySource(
+                DataArray(arr + i, dims=['y', 'x', 'band']),
+                IdentityCRSTransformer()) for i in range(3)
+        ]
+        window = Box(0, 0, 2, 2)
+
+        with patch.object(
+                sub_rss[1], 'get_chip', wraps=sub_rss[1].get_chip) as mock:
+            mrs = MultiRasterSource(sub_rss, channel_order=[6, 0])
+            self.assertEqual(mrs._used_source_idxs, [0, 2])
+            chip = mrs.get_chip(window)
+            chip_expected = np.stack(
+                [arr[:2, :2, 0] + 2, arr[:2, :2, 0]], axis=-1)
+            np.testing.assert_array_equal(chip, chip_expected)
+            np.testing.assert_array_equal(
+                mrs.get_chips([window, window]),
+                np.stack([chip_expected, chip_expected]))
+            mock.assert_not_called()
+
+            # the raw chip still includes all sub raster sources
+            self.assertEqual(mrs._get_chip(window).shape, (2, 2, 9))
+            mock.assert_called_once()
+
+    def test_read_concurrency(self):
+        cfg = make_cfg_diverse(diff_dtypes=False)
+        raster_sources = cfg.build(tmp_dir=self.tmp_dir).raster_sources
+        mrs_seq = MultiRasterSource(raster_sources, read_concurrency=1)
+        mrs_par = MultiRasterSource(raster_sources, read_concurrency=4)
+        self.assertFalse(mrs_seq._read_concurrently)
+        self.assertTrue(mrs_par._read_concurrently)
+        windows = [Box(0, 0, 10, 10), Box(0, 0, 600, 600)]
+        for window in windows:
+            np.testing.assert_array_equal(
+                mrs_par.get_chip(window), mrs_seq.get_chip(window))
+        np.testing.assert_array_equal(
+            mrs_par.get_chips(windows, out_shape=(10, 10)),
+            mrs_seq.get_chips(windows, out_shape=(10, 10)))
+
+        # never read the same sub raster source from multiple threads
+        rs = raster_sources[0]
+        mrs = MultiRasterSource([rs, rs, rs], read_concurrency=4)
+        self.assertFalse(mrs._read_concurrently)
+
+    def test_nested_read_concurrency(self):
+        # also reorder channels so that the channel gather is exercised in
+        # pool threads
+        channel_order = [2, 0, 1]
+
+        def make_mrs():
+            sub_rss = [
+                XarraySource(
+                    DataArray(
+                        np.full((5, 5, 1), i, dtype=np.uint8),
+                        dims=['y', 'x', 'band']), IdentityCRSTransformer())
+                for i in range(3)
+            ]
+            return MultiRasterSource(sub_rss, channel_order=channel_order)
+
+        # more outer sub raster sources than threads in the pool
+        rs = TemporalMultiRasterSource([make_mrs() for _ in range(10)])
+        self.assertTrue(rs._read_concurrently)
+        self.assertTrue(rs.raster_sources[0]._read_concurrently)
+        windows = [Box(0, 0, 2, 2), Box(1, 1, 3, 3)]
+        results = {}
+
+        def read():
+            results['chip'] = rs.get_chip(windows[0])
+            results['chips'] = rs.get_chips(windows)
+
+        # run in a separate thread so that a deadlock fails the test
+        # instead of hanging it
+        thread = Thread(target=read, daemon=True)
+        thread.start()
+        thread.join(timeout=30)
+        self.assertFalse(thread.is_alive(), 'Nested reads deadlocked.')
+
+        chip_expected = np.ones((10, 2, 2, 3), dtype=np.uint8)
+        chip_expected *= np.array(channel_order, dtype=np.uint8)
+        np.testing.assert_array_equal(results['chip'], chip_expected)
+        np.testing.assert_array_equal(results['chips'],
+                                      np.stack([chip_expected] * 2))
+
+    def test_map_coords_cache(self):
+        cfg = make_cfg_diverse(diff_dtypes=False)
+        rs = cfg.build(tmp_dir=self.tmp_dir)
+        window = Box(0, 0, 10, 10)
+        chip = rs.get_chip(window)
+        np.testing.assert_array_equal(rs.get_chip(window), chip)
+        cache_info = rs._pixel_to_map_cached.cache_info()
+        self.assertEqual(cache_info.misses, 1)
+        self.assertEqual(cache_info.hits, 1)
+
+        rs.set_bbox(Box(0, 0, 100, 100))
+        self.assertEqual(rs._pixel_to_map_cached.cache_info().currsize, 0)
+
+    def test_pickle(self):
+        arr = np.arange(5 * 5 * 3, dtype=np.uint8).reshape(5, 5, 3)
+        sub_rs = XarraySource(
+            DataArray(arr, dims=['y', 'x', 'band']), IdentityCRSTransformer())
+        rs = MultiRasterSource([sub_rs, sub_rs])
+        window = Box(0, 0, 2, 2)
+        chip_expected = rs.get_chip(window)
+        rs_unpickled = pickle.loads(pickle.dumps(rs))
+        np.testing.assert_array_equal(
+            rs_unpickled.get_chip(window), chip_expected)
+
     def test_temporal_sub_raster_sources(self):
         dtype = np.uint8
         arr = np.ones((2, 5, 5, 4), dtype=dtype)
@@ -225,6 +474,85 @@ class TestMultiRasterSource(unittest.TestCase):
         chip_expected[..., 4:] *= np.arange(4, dtype=np.uint8)
         np.testing.assert_array_equal(chip, chip_expected)
 
+    def test_get_chip_uneven_num_channels(self):
+        arr_1 = np.arange(5 * 5 * 2, dtype=np.uint8).reshape(5, 5, 2)
+        arr_2 = 100 + np.arange(5 * 5 * 3, dtype=np.uint8).reshape(5, 5, 3)
+        rs_1 = XarraySource(
+            DataArray(arr_1, dims=['y', 'x', 'band']),
+            IdentityCRSTransformer())
+        rs_2 = XarraySource(
+            DataArray(arr_2, dims=['y', 'x', 'band']),
+            IdentityCRSTransformer())
+        window = Box(1, 1, 4, 4)
+        chip_expected = np.concatenate(
+            [arr_1[1:4, 1:4], arr_2[1:4, 1:4]], axis=-1)
+
+        mrs = MultiRasterSource([rs_1, rs_2])
+        np.testing.assert_array_equal(mrs._get_chip(window), chip_expected)
+        np.testing.assert_array_equal(mrs.get_chip(window), chip_expected)
+
+        mrs = MultiRasterSource([rs_1, rs_2], primary_source_idx=1)
+        np.testing.assert_array_equal(mrs._get_chip(window), chip_expected)
+
+        mrs = MultiRasterSource([rs_1, rs_2], channel_order=[4, 0, 2])
+        np.testing.assert_array_equal(
+            mrs.get_chip(window), chip_expected[..., [4, 0, 2]])
+
+        # sub raster source 0 dropped entirely, repeated channel
+        mrs = MultiRasterSource([rs_1, rs_2], channel_order=[3, 4, 4])
+        np.testing.assert_array_equal(
+            mrs.get_chip(window), chip_expected[..., [3, 4, 4]])
+
+    def test_output_dtype(self):
+        cfg = make_cfg_diverse(diff_dtypes=False)
+        raster_sources = cfg.build(tmp_dir=self.tmp_dir).raster_sources
+        rs = MultiRasterSource(raster_sources, output_dtype=np.float16)
+        self.assertEqual(rs.dtype, np.float16)
+        window = Box(0, 0, 600, 600)
+        chip = rs.get_chip(window)
+        self.assertEqual(chip.dtype, np.float16)
+        self.assertEqual(set(np.unique(chip[..., 0])), {100})
+        self.assertEqual(set(np.unique(chip[..., 1])), {0, 175})
+        self.assertEqual(set(np.unique(chip[..., 2])), {0, 250})
+        # raw chips are not cast
+        self.assertEqual(rs._get_chip(window).dtype, np.uint8)
+
+        # transformers see the original dtype; values > 65504 are not
+        # representable in float16
+        arr = np.random.RandomState(0).randint(
+            0, 2**16, size=(10, 10, 1), dtype=np.uint16)
+        sub_rss = [
+            XarraySource(
+                DataArray(arr, dims=['y', 'x', 'band']),
+                IdentityCRSTransformer()) for _ in range(2)
+        ]
+        tf = StatsTransformer(means=[40000, 40000], stds=[10000, 10000])
+        window = Box(0, 0, 10, 10)
+        rs = MultiRasterSource(sub_rss, raster_transformers=[tf])
+        rs_fp16 = MultiRasterSource(
+            sub_rss, raster_transformers=[tf], output_dtype=np.float16)
+        chip_expected = rs.get_chip(window).astype(np.float16)
+        chip = rs_fp16.get_chip(window)
+        self.assertEqual(chip.dtype, np.float16)
+        np.testing.assert_array_equal(chip, chip_expected)
+        np.testing.assert_array_equal(
+            rs_fp16.get_chips([window]), chip_expected[np.newaxis])
+        raw_chip = rs_fp16.get_raw_chip(window)
+        self.assertEqual(raw_chip.dtype, np.uint16)
+        np.testing.assert_array_equal(raw_chip[..., :1], arr)
+
+    def test_get_chip_chw(self):
+        cfg = make_cfg_diverse(diff_dtypes=False, channel_order=[2, 0])
+        rs = cfg.build(tmp_dir=self.tmp_dir)
+        window = Box(0, 0, 600, 600)
+        chip_hwc = rs.get_chip(window)
+        chip_chw = rs.get_chip(window, layout='chw')
+        self.assertEqual(chip_chw.shape, (2, 600, 600))
+        self.assertTrue(chip_chw.flags.c_contiguous)
+        np.testing.assert_array_equal(chip_chw, chip_hwc.transpose(2, 0, 1))
+        self.assertRaises(ValueError,
+                          lambda: rs.get_chip(window, layout='whc'))
+
     def test_from_stac(self):
         item = Item.from_file(data_file_path('stac/item.json'))
 
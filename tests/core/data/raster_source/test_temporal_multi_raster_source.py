@@ -8,6 +8,7 @@ from rastervision.core.box import Box
 from rastervision.core.data.crs_transformer import IdentityCRSTransformer
 from rastervision.core.data.raster_source import (TemporalMultiRasterSource,
                                                   XarraySource)
+from rastervision.core.data.raster_transformer import StatsTransformer
 
 
 def make_raster_source(num_channels_raw: int, channel_order: List[int]):
@@ -70,6 +71,49 @@ class TestTemporalMultiRasterSource(unittest.TestCase):
             ], dtype=dtype)
         np.testing.assert_array_equal(chip, chip_expected)
 
+    def test_get_chips(self):
+        mrs = make_source()
+        windows = [Box(0, 0, 2, 2), Box(1, 1, 3, 3), Box(3, 0, 5, 2)]
+        chips = mrs.get_chips(windows)
+        chips_expected = np.stack([mrs.get_chip(w) for w in windows])
+        self.assertEqual(chips.shape, (3, 2, 2, 2, 3))
+        np.testing.assert_array_equal(chips, chips_expected)
+
+        # the transformer changes the dtype and its output depends on the
+        # input dtype
+        arr = np.random.RandomState(0).randint(
+            0, 2**16, size=(5, 5, 2), dtype=np.uint16)
+        sub_rss = [
+            XarraySource(
+                DataArray(arr // (i + 1), dims=['x', 'y', 'band']),
+                IdentityCRSTransformer()) for i in range(2)
+        ]
+        tf = StatsTransformer(means=[30000, 15000], stds=[10000, 5000])
+        mrs = TemporalMultiRasterSource(sub_rss, raster_transformers=[tf])
+        chips = mrs.get_chips(windows)
+        chips_expected = np.stack([mrs.get_chip(w) for w in windows])
+        self.assertEqual(chips.dtype, np.uint8)
+        np.testing.assert_array_equal(chips, chips_expected)
+
+    def test_output_dtype(self):
+        arr = np.random.RandomState(0).randint(
+            0, 2**16, size=(5, 5, 2), dtype=np.uint16)
+        sub_rss = [
+            XarraySource(
+                DataArray(arr, dims=['x', 'y', 'band']),
+                IdentityCRSTransformer()) for _ in range(2)
+        ]
+        tf = StatsTransformer(means=[40000, 40000], stds=[10000, 10000])
+        window = Box(0, 0, 5, 5)
+        mrs = TemporalMultiRasterSource(sub_rss, raster_transformers=[tf])
+        mrs_fp16 = TemporalMultiRasterSource(
+            sub_rss, raster_transformers=[tf], output_dtype=np.float16)
+        chip_expected = mrs.get_chip(window).astype(np.float16)
+        chip = mrs_fp16.get_chip(window)
+        self.assertEqual(chip.dtype, np.float16)
+        np.testing.assert_array_equal(chip, chip_expected)
+        self.assertEqual(mrs_fp16.get_raw_chip(window).dtype, np.uint16)
+
     def test_getitem(self):
         mrs = make_source()
         dtype = mrs.dtype
@@ -19,6 +19,16 @@ class TestCastTransformer(unittest.TestCase):
         self.assertEqual(out_chip.dtype, np.float32)
         self.assertEqual(str(tf), "CastTransformer(to_dtype='float32')")
 
+    def test_transform_inplace(self):
+        tf = CastTransformerConfig(to_dtype='float32').build()
+        in_chip = np.ones((10, 10, 3), dtype=np.uint16)
+        out_chip = tf.transform_inplace(in_chip)
+        self.assertEqual(out_chip.dtype, np.float32)
+
+        in_chip = np.ones((10, 10, 3), dtype=np.float32)
+        out_chip = tf.transform_inplace(in_chip)
+        self.assertIs(out_chip, in_chip)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -33,6 +33,21 @@ class TestMinMaxTransformer(unittest.TestCase):
         chip_out = tf.transform(chip_in)
         np.testing.assert_array_equal(chip_out, chip_expexted)
 
+    def test_transform_inplace(self):
+        tf = MinMaxTransformer()
+        chip_in = np.array([
+            [[-2], [0]],
+            [[8], [18]],
+        ])
+        chip_expexted = tf.transform(chip_in)
+
+        # int chip: falls back to transform()
+        chip_out = tf.transform_inplace(chip_in.copy())
+        np.testing.assert_array_equal(chip_out, chip_expexted)
+
+        chip_out = tf.transform_inplace(chip_in.astype(np.float32))
+        np.testing.assert_array_equal(chip_out, chip_expexted)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -57,6 +57,17 @@ class TestStatsTransformer(unittest.TestCase):
         chip_out_expected = np.ones((2, 2, 4)) * 170
         np.testing.assert_equal(chip_out, chip_out_expected)
 
+    def test_transform_inplace(self):
+        tf = StatsTransformer(np.ones((4, )), np.ones((4, )) * 2)
+        chip_in = np.ones((2, 2, 4)) * 3
+        chip_in[0, 0] = 0
+        chip_out_expected = tf.transform(chip_in)
+        # transform() must not modify its input
+        np.testing.assert_equal(chip_in[0, 1], [3, 3, 3, 3])
+        chip_out = tf.transform_inplace(chip_in)
+        np.testing.assert_equal(chip_out, chip_out_expected)
+        self.assertEqual(chip_out.dtype, np.uint8)
+
     def test_transform_with_channel_order(self):
         # All values have z-score of 1, which translates to
         # uint8 value of 170.
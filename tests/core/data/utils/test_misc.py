@@ -16,7 +16,8 @@ from rastervision.core.data import (
 from rastervision.core.data.utils.misc import ensure_json_serializable
 from rastervision.core.data.utils.geojson import geoms_to_geojson
 from rastervision.core.data.utils.misc import (
-    match_bboxes, parse_array_slices_2d, parse_array_slices_Nd)
+    aligned_empty, all_equal, match_bboxes, parse_array_slices_2d,
+    parse_array_slices_Nd)
 
 from tests import data_file_path
 
@@ -226,6 +227,40 @@ class TestParseArraySlices(unittest.TestCase):
         self.assertListEqual(dim_slices, [slice(0, 60, 2), slice(0, 40, 3)])
 
 
+class TestAllEqual(unittest.TestCase):
+    def test_all_equal(self):
+        self.assertTrue(all_equal([1, 1, 1]))
+        self.assertTrue(all_equal([1]))
+        self.assertTrue(all_equal([]))
+        self.assertFalse(all_equal([1, 1, 2]))
+        self.assertTrue(all_equal(x for x in ['a', 'a']))
+        self.assertFalse(all_equal(x for x in ['a', 'b']))
+
+    def test_short_circuit(self):
+        def gen():
+            yield 1
+            yield 2
+            raise AssertionError('all_equal did not short-circuit.')
+
+        self.assertFalse(all_equal(gen()))
+
+
+class TestAlignedEmpty(unittest.TestCase):
+    def test_aligned_empty(self):
+        cases = [
+            ((3, 5, 7), np.uint8, 64),
+            ((2, 4, 4, 3), np.float32, 32),
+            (10, int, 64),
+        ]
+        for shape, dtype, align in cases:
+            arr = aligned_empty(shape, dtype, align=align)
+            self.assertEqual(arr.shape, np.empty(shape).shape)
+            self.assertEqual(arr.dtype, np.dtype(dtype))
+            self.assertTrue(arr.flags.c_contiguous)
+            self.assertTrue(arr.flags.writeable)
+            self.assertEqual(arr.ctypes.data % align, 0)
+
+
 class TestEnsureJsonSerializable(unittest.TestCase):
     def assertNoError(self, fn: Callable, msg: str = ''):
         try: